@@ -6,13 +6,16 @@ import shutil
 import getpass
 import argparse
 import itertools
+import tempfile
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from time import sleep
 from tqdm import tqdm
-from datetime import timedelta
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC
-from mutagen.id3 import ID3, SYLT, USLT, Encoding, TIT2, TPE1, TALB, TCOM, TEXT
-from mutagen.id3._frames import TXXX
+from mutagen.id3 import ID3, SYLT, USLT, Encoding
 from mutagen.id3._util import ID3NoHeaderError
 
 ################################# MP3TAG CONFIG ######################################
@@ -41,6 +44,12 @@ def parse_arguments():
             return path
         else:
             raise argparse.ArgumentTypeError(f"readable_dir:{path} is not a valid path")
+
+    def positive_int(value):
+        if value.isdigit() and int(value) > 0:
+            return int(value)
+        else:
+            raise argparse.ArgumentTypeError(f"{value} is not a positive number")
         
     parser = argparse.ArgumentParser(description='''Test .lrc and .txt lyrics for broken links, embed synced and unsynced lyrics into tags,
 extract them from tags to files or populate the tags of external lyrics based on the tags of linked files.''')
@@ -81,6 +90,12 @@ Export: Overwrite the content of existing .lrc/.txt files.''')
 Use 'keep' or leave empty to retain existing timestamp formats and only fix mistakes like >59 minutes or >59 seconds.
 Use 'force.xx' to force all existing timestamps into `[hh:mm:ss.xx]` or `[mm:ss.xx]` format.
 Use 'force.xxx' to force all existing timestamps into `[hh:mm:ss.xxx]` or `[mm:ss.xxx]` format''')
+    parser.add_argument('-w', '--workers', type=positive_int, default=max_workers,
+                        help='''Import, Export, tag_external: Number of files read and written at the same time, defaults to 4 per CPU core, at most 32.
+Use 1 to process one file after another, e.g. on slow network shares.''')
+    parser.add_argument('--walk_workers', type=positive_int, default=1,
+                        help='''Number of directories listed at the same time while scanning, default: 1.
+Higher values like 16 can speed up scanning huge libraries on network shares, the order of found files changes to level by level.''')
 
     args: argparse.Namespace = parser.parse_args()
 
@@ -112,40 +127,75 @@ Use 'force.xxx' to force all existing timestamps into `[hh:mm:ss.xxx]` or `[mm:s
     return args
 
 ########################################## SHARED ############################################
+# Number of threads used for per-file work that is mostly waiting on disk I/O
+max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+# List a directory once, returns the DirEntry of its files and the paths of its subdirectories
+def scan_directory(current_dir, single_folder):
+    files = []
+    subdirs = []
+    with os.scandir(current_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not single_folder:
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                files.append(entry)
+    return files, subdirs
+
+# Yield the DirEntry of every file in directory, recursively if not called with -s, --single_folder
+def iter_files(directory, single_folder, walk_workers=1):
+    root = os.path.abspath(directory)
+    if walk_workers > 1 and not single_folder:
+        yield from iter_files_threaded(root, walk_workers)
+        return
+    pending_dirs = [root]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            files, subdirs = scan_directory(current_dir, single_folder)
+        except OSError as e: # Report unreadable directories instead of silently skipping their whole subtree
+            tqdm.write(f"Skipping {current_dir}, it could not be read: {e.strerror}")
+            continue
+        yield from files
+        # Reversed so subdirectories are visited in the same order as os.walk would
+        pending_dirs.extend(reversed(subdirs))
+
+# Walk one directory level at a time and list all directories of a level in parallel, pays off on network shares with high latency
+def iter_files_threaded(root, walk_workers):
+    level = [root]
+    with ThreadPoolExecutor(max_workers=walk_workers) as executor:
+        while level:
+            futures = [(current_dir, executor.submit(scan_directory, current_dir, False)) for current_dir in level]
+            level = []
+            for current_dir, future in futures:
+                try:
+                    files, subdirs = future.result()
+                except OSError as e:
+                    tqdm.write(f"Skipping {current_dir}, it could not be read: {e.strerror}")
+                    continue
+                yield from files
+                level.extend(subdirs)
+
 # Find all .lrc and .txt files in the directory specified with -d, recursively if not called with -s, --single
-def find_lrc_files(directory, single_folder, progress):
+def find_lrc_files(directory, single_folder, progress, walk_workers=1):
     lrc_files = []
     txt_files = []
-    pattern = r'^\d{2,3}\s' # Pattern to filter .txt files, default filters for names starting with 2 or 3 digits and a space, like "01 Hello.flac"
-
-    if not single_folder:
-        with tqdm(desc="searching", unit=" files", disable=not progress) as pbar:
-            lrc_count = 0
-            txt_count = 0
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    pbar.update(1)
-                    if file.endswith(".lrc"):
-                        lrc_files.append(os.path.join(os.path.abspath(root), file))
-                        lrc_count += 1
-                        pbar.set_postfix({"lrc": lrc_count, "txt": txt_count})
-                    elif file.endswith(".txt") and re.match(pattern, file):
-                        txt_files.append(os.path.join(os.path.abspath(root), file))
-                        txt_count += 1
-                        pbar.set_postfix({"lrc": lrc_count, "txt": txt_count})
-    else:
-        with tqdm(desc="searching", unit=" files", disable=not progress) as pbar:
-            lrc_count = 0
-            txt_count = 0
-            for file in os.listdir(directory):
-                if file.endswith(".lrc"):
-                    lrc_files.append(os.path.join(os.path.abspath(directory), file))
-                    lrc_count += 1
-                    pbar.set_postfix({"lrc": lrc_count, "txt": txt_count})              
-                elif file.endswith(".txt")and re.match(pattern, file):
-                    txt_files.append(os.path.join(os.path.abspath(directory), file))
-                    txt_count += 1
-                    pbar.set_postfix({"lrc": lrc_count, "txt": txt_count})
+    pattern = re.compile(r'^\d{2,3}\s') # Pattern to filter .txt files, default filters for names starting with 2 or 3 digits and a space, like "01 Hello.flac"
+
+    with tqdm(desc="searching", unit=" files", mininterval=0.5, disable=not progress) as pbar:
+        scanned = 0
+        for entry in iter_files(directory, single_folder, walk_workers):
+            scanned += 1
+            pbar.update(1)
+            suffix = entry.name[-4:] # Compare the suffix once, only .txt files go through the regex
+            if suffix == ".lrc":
+                lrc_files.append(entry.path)
+            elif suffix == ".txt" and pattern.match(entry.name):
+                txt_files.append(entry.path)
+            if scanned % 256 == 0: # Refreshing the postfix for every file slows down huge scans
+                pbar.set_postfix_str(f"lrc={len(lrc_files)}, txt={len(txt_files)}")
+        pbar.set_postfix_str(f"lrc={len(lrc_files)}, txt={len(txt_files)}")
 
     if len(lrc_files) == 0:
         lrc_files = None
@@ -158,25 +208,57 @@ def find_lrc_files(directory, single_folder, progress):
     else:
         return lrc_files, txt_files
 
+# Fold a file name so names that only differ in case or unicode normalization compare equal
+def fold_name(name):
+    return unicodedata.normalize("NFC", name).casefold()
+
+# List the (case normalized) names of the files in a directory and their folded names, empty if it can't be read
+def list_file_names(directory):
+    try:
+        with os.scandir(directory) as entries:
+            names = {os.path.normcase(entry.name) for entry in entries if entry.is_file()}
+    except OSError:
+        names = set()
+    return names, {fold_name(name) for name in names}
+
+# Check if name exists in a directory listing, path_check is only called for names that differ from a listed one in case,
+# as only the filesystem knows whether it is case-insensitive (macOS, SMB or NTFS mounts) where normcase does nothing
+def name_in_listing(listing, name, path, path_check):
+    names, folded_names = listing
+    if os.path.normcase(name) in names:
+        return True
+    return fold_name(name) in folded_names and path_check(path)
+
+# List the (case normalized) names of all entries in a directory and their folded names, empty if it can't be read
+def list_entry_names(directory):
+    try:
+        names = {os.path.normcase(name) for name in os.listdir(directory)}
+    except OSError:
+        names = set()
+    return names, {fold_name(name) for name in names}
+
 # Find matching songs from -e, --extensions list for .lrc and .txt files
 def find_matches(lyric_paths, file_ext, extensions, progress):
-    match_categories = dict.fromkeys(extensions)
-    for ext in extensions:
-        match_categories[ext] = []
-    match_categories["unlinked"] = []
-    with tqdm(total = len(lyric_paths), desc= f"finding {file_ext} matches", unit=f" {file_ext} files", disable=not progress) as pbar:
+    match_categories = defaultdict(list) # Categories only appear once they have a file, so there are no empty ones to prune
+    dir_file_names = {} # Each directory is listed once instead of calling os.path.isfile for every lyric and extension
+    with tqdm(total = len(lyric_paths), desc= f"finding {file_ext} matches", unit=f" {file_ext} files", mininterval=0.5, disable=not progress) as pbar:
         for song in lyric_paths:
             hits = False
+            song_base = os.path.splitext(song)[0]
+            song_dir, song_stem = os.path.split(song_base)
+            file_names = dir_file_names.get(song_dir)
+            if file_names is None:
+                file_names = dir_file_names[song_dir] = list_file_names(song_dir)
             for ext in extensions:
-                song_path = os.path.splitext(song)[0] + f'.{ext}'
-                if os.path.isfile(song_path):
+                song_path = song_base + f'.{ext}'
+                if name_in_listing(file_names, f'{song_stem}.{ext}', song_path, os.path.isfile):
                     match_categories[ext].append(song_path)
                     hits = True
-                    pbar.update(1)
             if not hits:
                 match_categories["unlinked"].append(song)
-    match_categories = {key: value for key, value in match_categories.items() if value != []}
-    return match_categories
+            pbar.update(1)
+    # Keep the categories in the order of -e, --extensions followed by "unlinked" for the logs
+    return {key: match_categories[key] for key in [*extensions, "unlinked"] if key in match_categories}
 
 ##################################### IMPORT MP3TAG #############################################
 # Open only songs with matching lyrics in mp3tag via CLI
@@ -350,6 +432,12 @@ def mp3tag_flow_single(match_categories, action_folder, overwrite_actions, exten
         else:
             sys.exit()
 
+# Format a result for the logs, failures are stored as {"path": ..., "error": ...}
+def format_log_entry(result):
+    if isinstance(result, dict):
+        return f"{result['path']} ({result['error']})"
+    return result
+
 # Log found lrc paths to disk, grouped by extension and if there is a matching song
 def write_log(match_categories, lyrics_ext, separate_logs, log_path):
     if not os.access(log_path, os.W_OK | os.X_OK):
@@ -360,38 +448,64 @@ def write_log(match_categories, lyrics_ext, separate_logs, log_path):
         with open(os.path.join(log_path, f"lyrict_{lyrics_ext}_results.log"), "w", encoding="utf8") as log:
             for category in categories:
                 log.write(f"{category} results:\n")
-                for result_path in match_categories[category]:
-                    log.write(result_path+"\n")
+                log.write("".join([result_path+"\n" for result_path in match_categories[category]]))
                 log.write("\n")
     else:
         for category in categories:
             with open(os.path.join(log_path, f"{lyrics_ext}_{category}.log"), "w", encoding="utf8") as log:
-                for result_path in match_categories[category]:
-                    log.write(result_path+"\n")
+                log.write("".join([result_path+"\n" for result_path in match_categories[category]]))
 
 #################################### IMPORT MUTAGEN ########################################
-def read_lyrics(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
+# Patterns used to parse .lrc files, compiled once at import instead of on every call
+LRC_LANGUAGE_PATTERN = re.compile(r'^\[la: *(\w{2,3})\]$', re.IGNORECASE | re.MULTILINE)
+LRC_OFFSET_PATTERN = re.compile(r'^\[offset: *([+-]\d+)\]$', re.IGNORECASE | re.MULTILINE)
+# Classifies every line of the file in one scan: either repeated timestamps [mm:ss.xxx][mm:ss.xxx]lyrics or a single [timestamp]lyrics.
+# A single timestamp line must not contain further timestamps, lines matching neither branch end up in "omitted" and are left out of SYLT.
+LRC_LINE_PATTERN = re.compile(r'^(?:(?P<timestamps>(?:\[(?:\d{1,2}:)?\d{1,3}:\d{1,2}(?:\.\d{2,3})?\] *){2,})(?P<multi_text>.*)'
+                              r'|\[(?:(?P<hours>\d{1,2}):)?(?P<minutes>\d{1,3}):(?P<seconds>\d{1,2})(?:\.(?P<milliseconds>\d{2,3}))?\] *(?!(?:.*<\d{1,3}:|\[\d{1,3}:))(?P<text>.*)'
+                              r'|(?P<omitted>.*))$', re.MULTILINE)
+LRC_MULTI_TIMESTAMP_PATTERN = re.compile(r'(\[(?:(\d{1,2}):)?(\d{1,3}):(\d{1,2})(?:\.(\d{2,3}))?\])')
+# Pattern to detect the language of unsynced lyrics line by line
+TXT_LANGUAGE_PATTERN = re.compile(r'^\[la: *(\w{2,3})\]$')
+
+# errors="replace" turns bytes that aren't valid UTF-8 into U+FFFD instead of failing the whole file
+def read_lyrics(file_path, errors="strict"):
+    # Lyrics files are small, reading the raw bytes and decoding them once skips the TextIOWrapper layer
+    with open(file_path, 'rb') as file:
+        lyrics = file.read().decode('utf-8-sig', errors) # utf-8-sig drops a leading BOM
+    if '\r' in lyrics: # Same newline translation as reading in text mode
+        lyrics = lyrics.replace('\r\n', '\n').replace('\r', '\n')
+    return lyrics
+
+# Read a lyrics file to embed, a file that isn't valid UTF-8 is embedded with U+FFFD for the bad bytes and recorded
+# in results["lossy"], so it is reported and never deleted
+def read_lyrics_to_embed(file_path, results):
+    try:
+        return read_lyrics(file_path)
+    except UnicodeDecodeError:
+        results["lossy"].append(file_path)
+        return read_lyrics(file_path, errors="replace")
+
+# Convert the captured parts of an lrc timestamp to milliseconds, hours and milliseconds are optional
+def lrc_timestamp_to_ms(hours, minutes, seconds, milliseconds):
+    timestamp = int(minutes) * 60000 + int(seconds) * 1000
+    if hours:
+        timestamp += int(hours) * 3600000
+    if milliseconds:
+        timestamp += int(milliseconds) * 10 if len(milliseconds) == 2 else int(milliseconds) # .xx are hundredths
+    return timestamp
 
 def parse_lrc_to_sylt(lyrics):
     sylt_lyrics = []
-    language_pattern = re.compile(r'^\[la: *(\w{2,3})\]$', re.IGNORECASE | re.MULTILINE)
-    offset_pattern = re.compile(r'^\[offset: *([+-]\d+)\]$', re.IGNORECASE | re.MULTILINE)
-    timestamp_pattern = re.compile(r'^\[(?:(\d{1,2}):)?(\d{1,3}):(\d{1,2})(?:\.(\d{2,3}))?\] *(?!(?:.*<\d{1,3}:|\[\d{1,3}:))(.*)$')
-    mutli_timestamp_check_pattern = re.compile(r'^(?:\[(?:\d{1,2}:)?\d{1,3}:\d{1,2}(?:\.\d{2,3})?\] *){2,}.*$')
-    multi_timestamp_pattern = re.compile(r'(\[(?:(\d{1,2}):)?(\d{1,3}):(\d{1,2})(?:\.(\d{2,3}))?\])')
-    multi_text_pattern = re.compile(r'^(?:\[(?:\d{1,2}:)?\d{1,3}:\d{1,2}(?:\.\d{2,3})?\])+ *(.*)$')
-    lines = lyrics.splitlines()
     omitted_lines = []
     language = ""
     offset = 0
     
     # Determine language and offset
-    match_lang = language_pattern.search(lyrics)
+    match_lang = LRC_LANGUAGE_PATTERN.search(lyrics)
     if match_lang:
             language = match_lang.group(1)
-    match_offset = offset_pattern.search(lyrics)
+    match_offset = LRC_OFFSET_PATTERN.search(lyrics)
     if match_offset:
             offset = int(match_offset.group(1))
 
@@ -399,46 +513,40 @@ def parse_lrc_to_sylt(lyrics):
     if not language:
         language = "eng"
 
-    for index, line in enumerate(lines):
-        if timestamp_pattern.match(line): # Append lines that follow a [timestamp]lyrics pattern.
-            match = timestamp_pattern.match(line)
-            hours, minutes, seconds, milliseconds, text = match.groups()
-            hours = int(hours) if hours else 0
-            minutes = int(minutes)
-            seconds = int(seconds)
-            milliseconds = int(milliseconds.ljust(3, '0')) if milliseconds else 0 # Convert to milliseconds 
-            timestamp = (hours * 3600000 + minutes * 60000 + seconds * 1000 + milliseconds + offset)
-            if timestamp >= 0:
-                sylt_lyrics.append((text.strip(), timestamp))
-        elif mutli_timestamp_check_pattern.match(line): # Detect repeated lines [mm:ss.xxx][mm:ss.xxx]...
-            timestamps = re.findall(multi_timestamp_pattern, line)
-            text = re.match(multi_text_pattern, line)
-            text = text.group(1).strip() if text else ""
-            for timestamp in timestamps:
-                hours = match[1]
-                minutes = int(match[2])
-                seconds = int(match[3])
-                milliseconds = match[4]
-                hours = int(hours) if hours else 0
-                milliseconds = int(milliseconds.ljust(3, '0')) if milliseconds else 0 # Convert to milliseconds
-                sylt_timestamp = (hours * 3600000 + minutes * 60000 + seconds * 1000 + milliseconds + offset)
+    # One match per line, so the regex engine walks the whole file instead of splitting it into a list of lines first
+    for index, match in enumerate(LRC_LINE_PATTERN.finditer(lyrics)):
+        if match.start() == len(lyrics): # Empty match behind a trailing newline, not a line of its own
+            break
+        if (line := match.group('omitted')) is not None:
+            omitted_lines.append(f"{index + 1} {line}")
+        elif match.group('timestamps'): # Detect repeated lines [mm:ss.xxx][mm:ss.xxx]...
+            text = match.group('multi_text').strip()
+            # Only scan the timestamp prefix, not the lyrics behind it
+            for _, hours, minutes, seconds, milliseconds in LRC_MULTI_TIMESTAMP_PATTERN.findall(match.group('timestamps')):
+                sylt_timestamp = lrc_timestamp_to_ms(hours, minutes, seconds, milliseconds) + offset
                 if sylt_timestamp > 0:
                     sylt_lyrics.append((text, sylt_timestamp))
-        else:
-            omitted_lines.append(f"{index + 1} {line}")
+        else: # Append lines that follow a [timestamp]lyrics pattern.
+            hours, minutes, seconds, milliseconds, text = match.group('hours', 'minutes', 'seconds', 'milliseconds', 'text')
+            timestamp = lrc_timestamp_to_ms(hours, minutes, seconds, milliseconds) + offset
+            if timestamp >= 0:
+                sylt_lyrics.append((text.strip(), timestamp))
 
     return language, sorted(sylt_lyrics, key=lambda x: x[1]), omitted_lines
 
-def embed_lyrics_flac(flac_file, lyrics=None, unsynced_lyrics=None, standardize=False, overwrite=False, results=None):
+# The lyric files are only read once it is clear that their tag will be written, re-runs over embedded songs don't touch them
+def embed_lyrics_flac(flac_file, lrc_path=None, txt_path=None, standardize=False, overwrite=False, results=None):
     audio = FLAC(flac_file)
     changed = False
-    if not 'LYRICS' in audio or overwrite: # Embed if lyrics are not already embedded or when overwrite is True
+    if lrc_path and (not 'LYRICS' in audio or overwrite): # Embed if lyrics are not already embedded or when overwrite is True
+        lyrics = read_lyrics_to_embed(lrc_path, results)
         if lyrics:
             if standardize:
                 lyrics = standardize_timestamps(lyrics, standardize)
             audio['LYRICS'] = lyrics
             changed = True
-    if not 'UNSYNCEDLYRICS' in audio or overwrite: # Embed if lyrics are not already embedded or when overwrite is True
+    if txt_path and (not 'UNSYNCEDLYRICS' in audio or overwrite): # Embed if lyrics are not already embedded or when overwrite is True
+        unsynced_lyrics = read_lyrics_to_embed(txt_path, results)
         if unsynced_lyrics:
             audio['UNSYNCEDLYRICS'] = unsynced_lyrics
             changed = True
@@ -448,16 +556,31 @@ def embed_lyrics_flac(flac_file, lyrics=None, unsynced_lyrics=None, standardize=
     else:
         results["skipped"].append(flac_file)
 
-def embed_lyrics_mp3(mp3_file, lyrics=None, unsynced_lyrics=None, overwrite=False, results=None):
+# Collect the SYLT and USLT frames of an ID3 tag in one pass. Their keys are "SYLT:desc:lang", never the bare frame ID,
+# so getall('SYLT') would fall back to checking every key of the tag with startswith, once per frame type.
+def lyric_frames(tags):
+    frames = {"SYLT": [], "USLT": []}
+    for key, frame in tags.items():
+        frame_list = frames.get(key[:4])
+        if frame_list is not None:
+            frame_list.append(frame)
+    return frames
+
+def embed_lyrics_mp3(mp3_file, lrc_path=None, txt_path=None, overwrite=False, results=None):
     try:
         audio = MP3(mp3_file, ID3=ID3)
     except ID3NoHeaderError:
         audio = MP3(mp3_file)
         audio.add_tags()
+    if audio.tags is None: # mutagen can also return a file without any tag instead of raising
+        audio.add_tags()
     changed = False
+    omitted_lines = []
+    frames = lyric_frames(audio.tags)
 
     # SYLT frame
-    if not any(isinstance(frame, SYLT) for frame in audio.tags.values()) or overwrite: # Embed if lyrics are not already embedded or when overwrite is True
+    if lrc_path and (not frames["SYLT"] or overwrite): # Embed if lyrics are not already embedded or when overwrite is True
+        lyrics = read_lyrics_to_embed(lrc_path, results)
         if lyrics:
             if overwrite:
                 audio.tags.delall('SYLT') # delete existing SYLT frames to avoid duplicates
@@ -467,16 +590,16 @@ def embed_lyrics_mp3(mp3_file, lyrics=None, unsynced_lyrics=None, overwrite=Fals
             changed = True
 
     # USLT frame
-    if not any(isinstance(frame, USLT) for frame in audio.tags.values()) or overwrite: # Embed if lyrics are not already embedded or when overwrite is True    
+    if txt_path and (not frames["USLT"] or overwrite): # Embed if lyrics are not already embedded or when overwrite is True
+        unsynced_lyrics = read_lyrics_to_embed(txt_path, results)
         if unsynced_lyrics:
-            language_pattern = re.compile(r'^\[la: *(\w{2,3})\]$')
             if overwrite:
                 audio.tags.delall('USLT') # delete existing USLT frames to avoid duplicates
-            for line in unsynced_lyrics:
-                if re.match(language_pattern, line):
-                    language == re.match(language_pattern, line).group(1)
-                else:
-                    language == "eng"
+            language = "eng" # Default to English if no language tag is found in the first 20 lines of the .txt file
+            for line in unsynced_lyrics.split('\n', 20)[:20]:
+                if match_lang := TXT_LANGUAGE_PATTERN.match(line):
+                    language = match_lang.group(1)
+                    break
             uslt_frame = USLT(encoding=Encoding.UTF8, lang=language, desc='', text=unsynced_lyrics)
             audio.tags.add(uslt_frame)
             changed = True
@@ -488,49 +611,69 @@ def embed_lyrics_mp3(mp3_file, lyrics=None, unsynced_lyrics=None, overwrite=Fals
     else:
         results["skipped"].append(mp3_file)
 
-def embed_lyrics(file_path, lrc_path=None, txt_path=None, standardize=False, overwrite=False, results=None):
-    lyrics = read_lyrics(lrc_path) if lrc_path else None
-    unsynced_lyrics = read_lyrics(txt_path) if txt_path else None
-    
-    if file_path.lower().endswith('.flac'):
-        embed_lyrics_flac(file_path, lyrics, unsynced_lyrics, standardize, overwrite, results)
-    elif file_path.lower().endswith('.mp3'):
-        embed_lyrics_mp3(file_path, lyrics, unsynced_lyrics, overwrite, results)
+# ext is the lowercase extension the song was matched by, so the path doesn't need to be checked again
+def embed_lyrics(file_path, ext, lrc_path=None, txt_path=None, standardize=False, overwrite=False, results=None):
+    if ext == "flac":
+        embed_lyrics_flac(file_path, lrc_path, txt_path, standardize, overwrite, results)
+    elif ext == "mp3":
+        embed_lyrics_mp3(file_path, lrc_path, txt_path, overwrite, results)
     else:
         raise ValueError("Unsupported file format. Only FLAC and MP3 are supported.")
 
-def import_lyrics(match_categories_lrc={}, match_categories_txt={}, delete_files=False, standardize=False, progress=False, overwrite=False):
+# Delete a file, returns the path and the error message if it could not be removed
+def remove_file(file_path):
+    try:
+        os.remove(file_path)
+        return file_path, None
+    except OSError as e:
+        return file_path, str(e)
+
+def import_lyrics(match_categories_lrc={}, match_categories_txt={}, delete_files=False, standardize=False, progress=False, overwrite=False, workers=max_workers):
     all_extensions = set(match_categories_lrc.keys()).union(set(match_categories_txt.keys()))
-    files_to_delete = []  # List to store files that need to be deleted
+    files_to_delete = {}  # Files that need to be deleted, a dict keeps them unique and in order
+    lossy_files = set()  # Lyrics that were not valid UTF-8 are kept, even if another song linked to them didn't read them
     combined_results = {"saved": [], "skipped": [], "deleted": [], "failed": [], "omitted_lines": []}
 
     for ext in all_extensions:
         if ext == "mp3" or ext == "flac":
             results = {"saved":[], "skipped": [], "failed": [], "omitted_lines": []}
-            lrc_paths = set(match_categories_lrc.get(ext, []))
-            txt_paths = set(match_categories_txt.get(ext, []))
-            with tqdm(total=len(lrc_paths | txt_paths), desc=f"embedding {ext}", unit=" files", disable=not progress) as pbar:
-                for path in lrc_paths | txt_paths:
-                    base_path = os.path.splitext(path)[0]
-                    lrc_path = base_path + '.lrc'
-                    txt_path = base_path + '.txt'
+            lrc_paths = frozenset(match_categories_lrc.get(ext, []))
+            txt_paths = frozenset(match_categories_txt.get(ext, []))
+            # Resolve the lyric paths of every song once up front as (song, lrc or None, txt or None)
+            song_tasks = []
+            for path in lrc_paths | txt_paths:
+                base_path = os.path.splitext(path)[0]
+                song_tasks.append((path, base_path + '.lrc' if path in lrc_paths else None, base_path + '.txt' if path in txt_paths else None))
+            # Runs in a worker thread, every task collects into its own results dict to avoid sharing lists between threads
+            def embed_task(path, lrc_path, txt_path):
+                task_results = {"saved": [], "skipped": [], "omitted_lines": [], "lossy": []}
+                embed_lyrics(path, ext, lrc_path=lrc_path, txt_path=txt_path, standardize=standardize, overwrite=overwrite, results=task_results)
+                return task_results, lrc_path, txt_path
+
+            # Embedding is I/O bound, so overlapping the reads and writes of many files in threads pays off despite the GIL
+            with tqdm(total=len(song_tasks), desc=f"embedding {ext}", unit=" files", mininterval=0.5, disable=not progress) as pbar, \
+                    ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(embed_task, *task): task[0] for task in song_tasks}
+                for done, future in enumerate(as_completed(futures), 1):
                     try:
-                        if path in lrc_paths and path in txt_paths:
-                            embed_lyrics(path, lrc_path=lrc_path, txt_path=txt_path, standardize=standardize, overwrite=overwrite, results=results)
-                        elif path in lrc_paths:
-                            embed_lyrics(path, lrc_path=lrc_path, standardize=standardize, overwrite=overwrite, results=results)
-                        elif path in txt_paths:
-                            embed_lyrics(path, txt_path=txt_path, standardize=standardize, overwrite=overwrite, results=results)
+                        task_results, lrc_path, txt_path = future.result()
+                        for lyric_path in task_results.pop("lossy"):
+                            lossy_files.add(lyric_path)
+                            results["failed"].append({"path": lyric_path, "error": "not valid UTF-8, embedded with replacement characters and kept"})
+                        for category, paths in task_results.items():
+                            results[category].extend(paths)
                         # Add files to delete list if delete_files is True
                         if delete_files:
                             if lrc_path:
-                                files_to_delete.append(lrc_path)
+                                files_to_delete[lrc_path] = None
                             if txt_path:
-                                files_to_delete.append(txt_path)
+                                files_to_delete[txt_path] = None
                     except Exception as e:
-                        results["failed"].append({"path": path, "error": str(e)})
-                    pbar.set_postfix({"saved": len(results["saved"]), "skipped": len(results["skipped"]), "failed": len(results["failed"])})
+                        results["failed"].append({"path": futures[future], "error": str(e)})
+                    if done % 256 == 0: # Refreshing the postfix for every file slows down huge imports
+                        pbar.set_postfix_str(f"saved={len(results['saved'])}, skipped={len(results['skipped'])}, failed={len(results['failed'])}")
                     pbar.update(1)
+                pbar.set_postfix_str(f"saved={len(results['saved'])}, skipped={len(results['skipped'])}, failed={len(results['failed'])}")
                 combined_results["saved"].extend(results["saved"])
                 combined_results["skipped"].extend(results["skipped"])
                 combined_results["failed"].extend(results["failed"])
@@ -538,10 +681,16 @@ def import_lyrics(match_categories_lrc={}, match_categories_txt={}, delete_files
         else:
             continue     
     # Delete files after processing all music files
-    if delete_files:
-        for file_path in set(files_to_delete):
-            os.remove(file_path)
-            combined_results["deleted"].append(file_path)
+    for lyric_path in lossy_files:
+        files_to_delete.pop(lyric_path, None)
+    if files_to_delete:
+        # Unlinking is a syscall per file, running them in threads overlaps the wait on slow or network drives
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for file_path, error in executor.map(remove_file, files_to_delete):
+                if error:
+                    combined_results["failed"].append({"path": file_path, "error": error})
+                else:
+                    combined_results["deleted"].append(file_path)
     return combined_results
 
 def write_import_log(results, separate_logs, log_path):
@@ -553,47 +702,38 @@ def write_import_log(results, separate_logs, log_path):
         with open(os.path.join(log_path, f"lyrict_import_results.log"), "w", encoding="utf8") as log:
             for category in categories:
                 if len(results[category]) > 0:
-                    log.write(f"{category} files:\n")
+                    lines = [f"{category} files:\n"] # Collected and written at once instead of one write per line
                     for result_path in results[category]:
                         if isinstance(result_path, tuple):
-                            log.write(result_path[0]+"\n")
-                            for line in result_path[1]:
-                                log.write(f"\t{line}\n")
+                            lines.append(result_path[0]+"\n")
+                            lines.extend([f"\t{line}\n" for line in result_path[1]])
                         else:
-                            log.write(result_path+"\n")
-                    log.write("\n")
+                            lines.append(format_log_entry(result_path)+"\n") # Failures are dicts with the error
+                    lines.append("\n")
+                    log.write("".join(lines))
     else:
         for category in categories:
             if len(results[category]) > 0:
                 with open(os.path.join(log_path, f"lyrict_import_{category}.log"), "w", encoding="utf8") as log:
-                    for result_path in results[category]:
-                        log.write(f"{result_path}\n")
+                    log.write("".join([f"{format_log_entry(result_path)}\n" for result_path in results[category]]))
 
 #################################### EXPORT MUTAGEN ########################################
 # Find all music files specified in -e, --extensions, default FLAC, MP3
-def find_music_files(directory, extensions, single_folder, progress):
-    exts = tuple(["." + extension for extension in extensions])
+def find_music_files(directory, extensions, single_folder, progress, walk_workers=1):
+    exts = frozenset("." + extension.lower() for extension in extensions) # Compared case-insensitively, like extract_lyrics does
     music_files = []
 
-    if not single_folder:
-        with tqdm(desc="searching music", unit=" files", disable=not progress) as pbar:
-            songs = 0
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    pbar.update(1)
-                    if file.endswith(exts):
-                        music_files.append(os.path.join(os.path.abspath(root), file))
-                        songs += 1
-                        pbar.set_postfix({"songs": songs})
-    else:
-        with tqdm(desc="searching", unit=" files", disable=not progress) as pbar:
-            songs = 0
-            for file in os.listdir(directory):
-                pbar.update(1)
-                if file.endswith(exts):
-                    music_files.append(os.path.join(os.path.abspath(directory), file))
-                    songs += 1
-                    pbar.set_postfix({"songs": songs})
+    with tqdm(desc="searching music", unit=" files", mininterval=0.5, disable=not progress) as pbar:
+        scanned = 0
+        for entry in iter_files(directory, single_folder, walk_workers):
+            scanned += 1
+            pbar.update(1)
+            name = entry.name
+            if name[name.rfind('.'):].lower() in exts:
+                music_files.append(entry.path)
+            if scanned % 256 == 0: # Refreshing the postfix for every file slows down huge scans
+                pbar.set_postfix_str(f"songs={len(music_files)}")
+        pbar.set_postfix_str(f"songs={len(music_files)}")
 
     if len(music_files) > 0:
         return music_files
@@ -603,59 +743,92 @@ def find_music_files(directory, extensions, single_folder, progress):
         sys.exit()
 
 # Extract lyrics from MP3 and FLAC files
-def extract_lyrics(file_paths, progress, standardize):
+# With keep_keys the tag keys of the lyrics found in each file are returned as well, so purge_tags can remove them without
+# searching the tag again. Only the keys are kept, the parsed files would hold the cover art of whole libraries in memory.
+def extract_lyrics(file_paths, progress, standardize, workers=max_workers, keep_keys=False):
     synced_lyrics = []
     unsynced_lyrics = []
-    with tqdm(total=len(file_paths), desc="extracting lyrics", unit=" lyrics", disable=not progress) as pbar:
+    lyric_keys = {}
+    # Runs in a worker thread, every file collects into its own lists which are merged in the original file order
+    def extract_task(file_path):
+        file_synced = []
+        file_unsynced = []
+        file_keys = [] if keep_keys else None
+        process_file = LYRIC_EXTRACTORS.get(os.path.splitext(file_path)[1].lower())
+        if process_file is None:
+            return None
+        process_file(file_path, file_synced, file_unsynced, standardize, file_keys)
+        return file_synced, file_unsynced, file_keys
+
+    # Reading the tags is I/O bound, so the threads overlap the disk reads of many files
+    with tqdm(total=len(file_paths), desc="extracting lyrics", unit=" lyrics", mininterval=0.5, disable=not progress) as pbar, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
         synced_count = 0
         unsynced_count = 0
-        for file_path in file_paths:
-            if file_path.lower().endswith(".mp3"):
-                synced, unsynced = process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize)
-            elif file_path.lower().endswith(".flac"):
-                synced, unsynced = process_flac(file_path, synced_lyrics, unsynced_lyrics, standardize)
-            else:
+        for done, (file_path, result) in enumerate(zip(file_paths, executor.map(extract_task, file_paths)), 1):
+            pbar.update(1)
+            if result is None:
                 continue
-            
-            if synced:
+            file_synced, file_unsynced, file_keys = result
+            synced_lyrics.extend(file_synced)
+            unsynced_lyrics.extend(file_unsynced)
+            if file_keys:
+                lyric_keys[file_path] = file_keys
+
+            if file_synced:
                 synced_count += 1
-            if unsynced:
+            if file_unsynced:
                 unsynced_count += 1
-            
-            pbar.set_postfix({"synced": synced_count, "unsynced": unsynced_count})
-            pbar.update(1)
-    return synced_lyrics, unsynced_lyrics
+            if done % 256 == 0: # Refreshing the postfix for every file slows down huge exports
+                pbar.set_postfix_str(f"synced={synced_count}, unsynced={unsynced_count}")
+        pbar.set_postfix_str(f"synced={synced_count}, unsynced={unsynced_count}")
+    return synced_lyrics, unsynced_lyrics, lyric_keys
+
+# Split a duration in milliseconds into hours, minutes, seconds and milliseconds
+def split_milliseconds(duration):
+    seconds, milliseconds = divmod(duration, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return hours, minutes, seconds, milliseconds
+
+# Zero padded numbers for the minutes, seconds and milliseconds of a timestamp, indexing them is faster than formatting each one
+TWO_DIGITS = [f"{number:02}" for number in range(100)]
+THREE_DIGITS = [f"{number:03}" for number in range(1000)]
+
+# Format a single SYLT entry as [hh:mm:ss.xxx]text or [mm:ss.xxx]text
+def format_lrc_line(text, timestamp):
+    hours, minutes, seconds, milliseconds = split_milliseconds(timestamp)
+    # change "]{text}" to "] {text}" in both lines if you want "[00:00.000] text"
+    if hours > 0:
+        return f'[{hours:02}:{TWO_DIGITS[minutes]}:{TWO_DIGITS[seconds]}.{THREE_DIGITS[milliseconds]}]{text}'
+    return f'[{TWO_DIGITS[minutes]}:{TWO_DIGITS[seconds]}.{THREE_DIGITS[milliseconds]}]{text}'
+
+# Format the (text, timestamp) pairs of a SYLT frame. Cached since re-rips and multi-disc sets often embed identical lyrics,
+# those are found next to each other so a small cache is enough and only pins the text of a few frames
+@lru_cache(maxsize=64)
+def sylt_text_to_lrc(sylt_text):
+    return "\n".join([format_lrc_line(text, timestamp) for text, timestamp in sylt_text])
 
 # Function to extract and format SYLT to LRC style
 def extract_sylt_to_lrc(sylt_frame):
-    lrc_lines = []
-    for text, timestamp in sylt_frame.text:
-        # Convert milliseconds to timedelta
-        duration = timedelta(milliseconds=timestamp)
-        
-        # Directly extract hours, minutes, seconds, and milliseconds
-        hours = duration.seconds // 3600
-        minutes = (duration.seconds % 3600) // 60
-        seconds = duration.seconds % 60
-        milliseconds = duration.microseconds // 1000  # Convert microseconds directly to milliseconds
-
-        # Format the output as [hh:mm:ss.xxx] or [mm:ss.xxx]
-        if hours > 0:
-            timestamp_formatted = f'[{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}]'
-        else:
-            timestamp_formatted = f'[{minutes:02}:{seconds:02}.{milliseconds:03}]'
-        lrc_line = f"{timestamp_formatted}{text}" # change "{lrc_timestamp}{text}" to "{lrc_timestamp} {text}" if you want "[00:00.00] text"
-        lrc_lines.append(lrc_line)
-    lrc_content = "\n".join(lrc_lines)
-    return lrc_content
+    try:
+        return sylt_text_to_lrc(tuple(sylt_frame.text)) # mutagen parses the entries as (str, int) tuples, so the tuple is hashable
+    except TypeError: # Entries set by other code may not be hashable, those are formatted without the cache
+        return sylt_text_to_lrc.__wrapped__(sylt_frame.text)
 
-def process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize):
+def process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize, lyric_keys=None):
     audio = MP3(file_path, ID3=ID3)
     synced = False
     unsynced = False
 
-    for tag in audio.tags.values():
-        if isinstance(tag, SYLT):
+    if audio.tags is None: # No ID3 header, nothing to extract
+        return synced, unsynced
+
+    # One pass over the frame keys in tag order, the keys are "SYLT:desc:lang" and "USLT:desc:lang" rather than the bare
+    # frame ID, so there is no direct lookup for them and getall would scan every key once per frame type instead
+    for key, tag in audio.tags.items():
+        frame_id = key[:4]
+        if frame_id == "SYLT":
             # Extract language and description
             lang = tag.lang
             desc = tag.desc
@@ -667,7 +840,7 @@ def process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize):
             synced_lyrics.append((file_path, lrc_content, lang, desc))
             synced = True
 
-        elif isinstance(tag, USLT):
+        elif frame_id == "USLT":
             # Extract language for unsynced lyrics
             lang = tag.lang
             desc = None
@@ -676,7 +849,7 @@ def process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize):
             unsynced_lyrics.append((file_path, tag.text, lang, desc))
             unsynced = True
 
-        elif isinstance(tag, TXXX) and tag.desc == "LYRICS":
+        elif key == "TXXX:LYRICS": # Exact key, a startswith check would also match descriptions like "LYRICS:..."
             lyrics = tag.text[0]
             if standardize:
                 lyrics = standardize_timestamps(lyrics, standardize)
@@ -685,189 +858,303 @@ def process_mp3(file_path, synced_lyrics, unsynced_lyrics, standardize):
             synced_lyrics.append((file_path, lyrics, None, None))
             synced = True
 
+        else:
+            continue
+        if lyric_keys is not None:
+            lyric_keys.append(key)
+
     return synced, unsynced
 
 # Extract lyrics from FLAC files
-def process_flac(file_path, synced_lyrics, unsynced_lyrics, standardize):
+def process_flac(file_path, synced_lyrics, unsynced_lyrics, standardize, lyric_keys=None):
     audio = FLAC(file_path)
     synced = False
     unsynced = False
-    if "LYRICS" in audio:
-        lyrics = audio["LYRICS"][0]
+    # get looks each tag up once instead of a membership test followed by the read
+    lyrics_values = audio.get("LYRICS")
+    if lyrics_values:
+        lyrics = lyrics_values[0]
         if standardize:
             lyrics = standardize_timestamps(lyrics, standardize)
         synced_lyrics.append((file_path, lyrics, None, None))
         synced = True
-    if "UNSYNCEDLYRICS" in audio:
-        unsynced_lyrics.append((file_path, audio["UNSYNCEDLYRICS"][0], None, None))
+        if lyric_keys is not None:
+            lyric_keys.append("LYRICS")
+    unsynced_values = audio.get("UNSYNCEDLYRICS")
+    if unsynced_values:
+        unsynced_lyrics.append((file_path, unsynced_values[0], None, None))
         unsynced = True
+        if lyric_keys is not None:
+            lyric_keys.append("UNSYNCEDLYRICS")
     return synced, unsynced
 
+# Extractor for each supported extension, looked up once per file instead of testing the path for every format
+LYRIC_EXTRACTORS = {
+    ".mp3": process_mp3,
+    ".flac": process_flac,
+}
+
+# Patterns used to standardize timestamps, compiled once at import instead of on every call
+# Also consumes the spaces behind a closing ], so they are dropped in the same pass that reformats the timestamp
+TIMESTAMP_PATTERN = re.compile(r"(?<=[\[<])((?:\d{1,2}:)?\d{1,3}:\d{1,2}(?:\.\d{2,3})?)(?:(\]) *|(?=>))")
+# Spaces behind any other ] that follows two digits, e.g. header lines like [offset:+500] or [length: 03:45]
+TAG_SPACE_PATTERN = re.compile(r"(?<=\d{2}\]) +")
+TIMESTAMP_SPLIT_PATTERN = re.compile(r"(?:(\d{1,2}):)?(\d{1,3}):(\d{1,2})(?:\.(\d{2,3}))?")
+# Runs of empty lines, reduced to a single empty line
+EMPTY_LINES_PATTERN = re.compile(r"\n{3,}")
+# Spaces and tabs at the end of a line
+TRAILING_SPACE_PATTERN = re.compile(r"[ \t]+$", re.MULTILINE)
+# Pattern to replace the language tag of exported .lrc files
+LANGUAGE_TAG_PATTERN = re.compile(r'\[la: *(\w{2,3})\]')
+
+# Format the hh:mm:ss or mm:ss part of a standardized timestamp, hours are left out if 0
+def format_clock(hours, minutes, seconds):
+    if hours:
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
+    return f"{minutes:02}:{seconds:02}"
+
+# --standardize keep: retain the original .xx or .xxx precision, or none if the timestamp had none
+def format_timestamp_keep(hours, minutes, seconds, milliseconds, raw_ms):
+    formatted_time = format_clock(hours, minutes, seconds)
+    if raw_ms:  # If milliseconds were present in original format, the split pattern only captures 2 or 3 digits
+        if len(raw_ms) == 2:
+            formatted_time += f".{raw_ms}"
+        else:
+            formatted_time += f".{milliseconds:03}"
+    return formatted_time
+
+# --standardize force.xx: always .xx, longer fractions are cut to two digits
+def format_timestamp_xx(hours, minutes, seconds, milliseconds, raw_ms):
+    return f"{format_clock(hours, minutes, seconds)}.{raw_ms[:2] if raw_ms else '00'}"
+
+# --standardize force.xxx: always .xxx, milliseconds are 0 if the original had none
+def format_timestamp_xxx(hours, minutes, seconds, milliseconds, raw_ms):
+    return f"{format_clock(hours, minutes, seconds)}.{milliseconds:03}"
+
+# Formatter used for each --standardize choice
+TIMESTAMP_FORMATTERS = {
+    "keep": format_timestamp_keep,
+    "force.xx": format_timestamp_xx,
+    "force.xxx": format_timestamp_xxx,
+}
+
 # standardize timestamps, output formats hh:mm:ss.xxx, hh:mm:ss, mm:ss.xxx, mm:ss
 def standardize_timestamps(lyrics, standardize):
+    format_timestamp = TIMESTAMP_FORMATTERS[standardize] # Chosen once per call instead of for every timestamp
+
     def fix_timestamp(match):
         # Split the timestamp into components
-        units_split = re.match(split_timestamp_pattern, match.group(1))
-        
-        hours = int(units_split.group(1)) if units_split.group(1) else 0
-        minutes = int(units_split.group(2))
-        seconds = int(units_split.group(3))
-        milliseconds = int(units_split.group(4).ljust(3, '0')) if units_split.group(4) else None
+        units_split = TIMESTAMP_SPLIT_PATTERN.match(match.group(1))
         raw_ms = units_split.group(4)
 
-        # Use timedelta to handle atypical timestamps
-        total_time = timedelta(hours=hours, minutes=minutes, seconds=seconds, milliseconds=milliseconds or 0)
-        
-        # Directly extract hours, minutes, seconds, and milliseconds
-        hours = total_time.seconds // 3600
-        minutes = (total_time.seconds % 3600) // 60
-        seconds = total_time.seconds % 60
-        milliseconds = total_time.microseconds // 1000  # Convert microseconds directly to milliseconds
-
-        if standardize == 'keep':
-            # Format the timestamp accordingly
-            if hours:
-                formatted_time = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    if re.match(two_digit_pattern, raw_ms):
-                        formatted_time += f".{raw_ms.ljust(2, '0')[:2]}"
-                    elif re.match(three_digit_pattern, raw_ms):
-                        formatted_time += f".{milliseconds:03}"
-            else:
-                formatted_time = f"{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    if re.match(two_digit_pattern, raw_ms):
-                        formatted_time += f".{raw_ms.ljust(2, '0')[:2]}"
-                    elif re.match(three_digit_pattern, raw_ms):
-                        formatted_time += f".{milliseconds:03}"
-        elif standardize == 'force.xx':
-            # Format the timestamp accordingly
-            if hours:
-                formatted_time = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    formatted_time += f".{raw_ms.ljust(2, '0')[:2]}"
-                else:
-                    formatted_time += ".00"
-            else:
-                formatted_time = f"{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    formatted_time += f".{raw_ms.ljust(2, '0')[:2]}"
-                else:
-                    formatted_time += ".00"
-        elif standardize == 'force.xxx':
-            # Format the timestamp accordingly
-            if hours:
-                formatted_time = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    formatted_time += f".{milliseconds:03}"
-                else:
-                    formatted_time += ".000"
-            else:
-                formatted_time = f"{int(minutes):02}:{int(seconds):02}"
-                if raw_ms:  # If milliseconds were present in original format
-                    formatted_time += f".{milliseconds:03}"
-                else:
-                    formatted_time += ".000"
-        return formatted_time
-
-    # Regular expressions for matching timestamps
-    timestamp_pattern = re.compile(r"(?<=[\[<])((?:\d{1,2}:)?\d{1,3}:\d{1,2}(?:\.\d{2,3})?)(?=[\]>])", re.MULTILINE)
-    split_timestamp_pattern = re.compile(r"(?:(\d{1,2}):)?(\d{1,3}):(\d{1,2})(?:\.(\d{2,3}))?")
-    two_digit_pattern = re.compile(r'^\d{2}$')
-    three_digit_pattern = re.compile(r'^\d{3}$')
+        # Normalize atypical timestamps like [00:75.00] by converting to milliseconds and back
+        hours, minutes, seconds, milliseconds = split_milliseconds(lrc_timestamp_to_ms(*units_split.groups()))
+        return format_timestamp(hours, minutes, seconds, milliseconds, raw_ms) + (match.group(2) or "") # Closing ] without the spaces
 
-    # Replace timestamps and remove space after each timestamp in one go
-    lyrics = re.sub(timestamp_pattern, fix_timestamp, lyrics)
-    lyrics = re.sub(r"(\d{2}\]) +", r"\1", lyrics)
+    # Replace timestamps and remove the space after them, each pass is skipped when the characters it needs are missing, e.g. for unsynced lyrics
+    if '[' in lyrics or '<' in lyrics:
+        lyrics = TIMESTAMP_PATTERN.sub(fix_timestamp, lyrics)
+    if '] ' in lyrics:
+        lyrics = TAG_SPACE_PATTERN.sub("", lyrics)
 
     # Reduce multiple empty lines to a single empty line
-    lyrics = re.sub(r'\n{2,}', '\n\n', lyrics)
+    if '\n\n\n' in lyrics:
+        lyrics = EMPTY_LINES_PATTERN.sub("\n\n", lyrics)
 
     return lyrics
 
+# Check if a file already contains text as it would be written in text mode, False if it can't be read
+def file_has_text(file_path, text):
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read() == text.replace('\n', os.linesep).encode('utf-8')
+    except OSError:
+        return False
+
+# Write text directly into a file, used where replacing the file would change more than its content
+def write_text_in_place(file_path, text):
+    with open(file_path, 'w', encoding="utf-8") as file:
+        file.write(text)
+
+# Create a new file with text, a write that fails halfway removes the file again
+def write_text_new(file_path, text):
+    with open(file_path, 'x', encoding="utf-8") as file: # Fails instead of truncating a file created in the meantime
+        try:
+            file.write(text)
+        except BaseException:
+            file.close()
+            os.remove(file_path)
+            raise
+
+# Write text to a file. New files are created directly, existing files are replaced through a temporary file,
+# so an interrupted run never leaves a half written version of lyrics that were already there
+def write_text_atomic(file_path, text):
+    if os.path.islink(file_path): # Replace the file a symlink points to, not the link itself
+        file_path = os.path.realpath(file_path)
+    try:
+        target_stat = os.stat(file_path)
+    except FileNotFoundError:
+        try:
+            write_text_new(file_path, text)
+            return
+        except FileExistsError:
+            target_stat = os.stat(file_path)
+    if target_stat.st_nlink > 1: # Replacing would split the file from its other hardlinks
+        write_text_in_place(file_path, text)
+        return
+    try:
+        # A unique name next to the target, so no file of the user is overwritten and os.replace stays on one filesystem
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".lyrict-", suffix=".tmp")
+    except PermissionError: # The directory is read-only but the file may still be writable
+        write_text_in_place(file_path, text)
+        return
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding="utf-8") as file:
+            file.write(text)
+            temp_stat = os.fstat(file.fileno())
+        os.chmod(temp_path, target_stat.st_mode & 0o7777) # mkstemp creates files as 0o600, keep the mode of the replaced file
+        if (temp_stat.st_uid, temp_stat.st_gid) != (target_stat.st_uid, target_stat.st_gid):
+            try:
+                os.chown(temp_path, target_stat.st_uid, target_stat.st_gid)
+            except (OSError, AttributeError): # The owner can't be kept (or there is no chown on Windows), write in place instead
+                os.remove(temp_path)
+                write_text_in_place(file_path, text)
+                return
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 # Export embedded lyrics to .lrc and .txt files
-def write_lrc_files(lyrics, extension, overwrite, progress, write_success):
-    with tqdm(total = len(lyrics), desc=f"saving {extension}", unit=f" {extension} files", disable=not progress) as pbar:
-        saved = 0
-        skipped = 0
-        failed = 0
-        for filename, lyrics, lang, desc in lyrics:
-            pbar.update(1)
-            basename = os.path.splitext(filename)[0]
-            lyrics_filename = basename + extension
-            language_pattern = re.compile(r'\[la: *(\w{2,3})\]')
+def write_lrc_files(lyrics, extension, overwrite, progress, write_success, workers=max_workers):
+    # Group the songs by lyric file, so a file is never written by two threads at once and duplicates keep their order.
+    # The key is folded, names that only differ in case can be the same file on case-insensitive filesystems.
+    lyric_files = {}
+    dir_entry_names = {} # Each directory is listed once instead of calling os.path.exists for every file
+    for filename, song_lyrics, lang, desc in lyrics:
+        lyrics_filename = os.path.splitext(filename)[0] + extension
+        exists = False
+        if not overwrite:
+            lyrics_dir, lyrics_name = os.path.split(lyrics_filename)
+            entry_names = dir_entry_names.get(lyrics_dir)
+            if entry_names is None:
+                entry_names = dir_entry_names[lyrics_dir] = list_entry_names(lyrics_dir)
+            exists = name_in_listing(entry_names, lyrics_name, lyrics_filename, os.path.exists)
+        lyric_files.setdefault(fold_name(lyrics_filename), []).append((filename, lyrics_filename, song_lyrics, lang, exists))
+
+    # Runs in a worker thread, writes the lyrics of every song linked to one lyric file in their original order
+    def write_task(songs):
+        task_results = []
+        written = False
+        for filename, lyrics_filename, lyrics, lang, exists in songs:
+            if written and not overwrite: # A song before this one may have created the file, skip it as os.path.exists did
+                exists = os.path.exists(lyrics_filename)
             if extension == ".lrc" and lang is not None:
-                if re.search(language_pattern, lyrics):
-                    lyrics = re.sub(language_pattern, f"[la:{lang}]", lyrics)
-                else:
+                # subn replaces and counts in one scan, the tag is prepended if there was none to replace
+                lyrics, replaced = LANGUAGE_TAG_PATTERN.subn(f"[la:{lang}]", lyrics)
+                if not replaced:
                     lyrics = f"[la:{lang}]\n" + lyrics
-            lyrics = '\n'.join(line.strip() for line in lyrics.split('\r\n'))
-            if not os.path.exists(lyrics_filename) or overwrite:
+            if '\r' in lyrics: # Convert \r\n and lone \r line breaks and drop the spaces left at the end of those lines
+                lyrics = TRAILING_SPACE_PATTERN.sub("", lyrics.replace('\r\n', '\n').replace('\r', '\n'))
+            lyrics = lyrics.strip()
+            # With overwrite, files that already hold exactly these lyrics are skipped instead of rewritten
+            if (overwrite and not file_has_text(lyrics_filename, lyrics)) or (not overwrite and not exists):
                 try:
-                    with open(lyrics_filename, 'w', encoding="utf-8") as f:
-                        f.write(lyrics)
-                    write_success["saved"].append((filename, extension))
-                    saved += 1
-                    pbar.set_postfix({"saved": saved, "skipped": skipped})
-                except PermissionError:
-                    write_success["failed"].append((filename, extension))
-                    failed += 1
-                    print(f"Failed to write {lyrics_filename} due to missing write permissions.")
+                    write_text_atomic(lyrics_filename, lyrics)
+                    written = True
+                    task_results.append(("saved", filename, lyrics_filename, None))
+                except OSError as e: # A file that can't be written fails on its own, the other files are still written
+                    task_results.append(("failed", filename, lyrics_filename, str(e)))
             else:
-                write_success["skipped"].append((filename, extension))
-                skipped += 1
-                pbar.set_postfix({"saved": saved, "skipped": skipped})
-    return saved, skipped, failed
+                task_results.append(("skipped", filename, lyrics_filename, None))
+        return task_results
+
+    # Writing many small files is I/O bound, so threads overlap the disk writes and directory updates
+    with tqdm(total = len(lyrics), desc=f"saving {extension}", unit=f" {extension} files", mininterval=0.5, disable=not progress) as pbar, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        counts = {"saved": 0, "skipped": 0, "failed": 0}
+        for done, task_results in enumerate(executor.map(write_task, lyric_files.values()), 1): # Results come back in the original order for the logs
+            for category, filename, lyrics_filename, error in task_results:
+                counts[category] += 1
+                if category == "failed":
+                    write_success[category].append((filename, extension, error))
+                    tqdm.write(f"Failed to write {lyrics_filename}: {error}")
+                else:
+                    write_success[category].append((filename, extension))
+            pbar.update(len(task_results))
+            if done % 256 == 0: # Refreshing the postfix for every file slows down huge exports
+                pbar.set_postfix_str(f"saved={counts['saved']}, skipped={counts['skipped']}")
+        pbar.set_postfix_str(f"saved={counts['saved']}, skipped={counts['skipped']}")
+    return counts["saved"], counts["skipped"], counts["failed"]
+
+# Padding callback for mutagen saves, the space freed by removed tags becomes padding so the tag is rewritten in place
+# instead of shrinking it and rewriting the whole audio stream behind it
+def keep_padding(info):
+    return max(info.padding, 0)
+
+# Remove the embedded lyrics tags from a single file, lyric_keys are the keys extract_lyrics found in it
+def purge_file(file_path, lyric_keys=None):
+    if file_path.lower().endswith(".mp3"):
+        audio = MP3(file_path, ID3=ID3)
+        if audio.tags is None: # No ID3 tag, so there are no lyrics to remove
+            return
+        if lyric_keys is not None:
+            # The frames were already found during the export, so they are popped by key without searching the tag again
+            for key in lyric_keys:
+                audio.tags.pop(key, None)
+        else:
+            # Remove TXXX:LYRICS, SYLT, and USLT tags by their keys instead of checking every frame
+            audio.tags.pop("TXXX:LYRICS", None) # Exact key, delall would also remove descriptions like "LYRICS:..."
+            audio.tags.delall("SYLT")
+            audio.tags.delall("USLT")
+        # Save with ID3v2.3
+        audio.save(v2_version=3, padding=keep_padding)
+
+    elif file_path.lower().endswith(".flac"):
+        audio = FLAC(file_path)
+        # Remove TXXX:LYRICS and TXXX:UNSYNCEDLYRICS tags
+        for tag in lyric_keys if lyric_keys is not None else ("LYRICS", "UNSYNCEDLYRICS"):
+            audio.pop(tag, None) # No KeyError for missing tags, or files without any tags
+        # Save the file
+        audio.save(padding=keep_padding)
 
 # Remove embedded lyrics tags from files
-def purge_tags(write_success, progress):
+def purge_tags(write_success, progress, workers=max_workers, lyric_keys=None):
+    if lyric_keys is None:
+        lyric_keys = {}
     saved_list = [filepath for filepath, _ in write_success["saved"]]
     skipped_list = [filepath for filepath, _ in write_success["skipped"]]
-    failed_list = [filepath for filepath, _ in write_success["failed"]]
+    failed_set = {filepath for filepath, *_ in write_success["failed"]}
     combined_list = saved_list + skipped_list
-    seen = set()
-    # Filter out "failed" file paths and remove duplicates
-    delete_me = [filepath for filepath in combined_list if filepath not in failed_list and (filepath not in seen and seen.add(filepath) is None)]
+    # Filter out "failed" file paths and remove duplicates while keeping the order
+    delete_me = list(dict.fromkeys(filepath for filepath in combined_list if filepath not in failed_set))
+    purged = 0
+    failed = 0
     if len(delete_me) > 0:
-        with tqdm(total=len(delete_me), desc="purging embedded lyrics", unit=" files", disable=not progress) as pbar:
-            purged = 0
-            failed = 0
-            for file_path in delete_me:
+        # Saving rewrites the whole tag block of each file, so the threads overlap that disk I/O
+        with tqdm(total=len(delete_me), desc="purging embedded lyrics", unit=" files", mininterval=0.5, disable=not progress) as pbar, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(purge_file, file_path, lyric_keys.get(file_path)): file_path for file_path in delete_me}
+            for done, future in enumerate(as_completed(futures), 1):
                 try:
-                    if file_path.lower().endswith(".mp3"):
-                        audio = MP3(file_path, ID3=ID3)
-                        # Remove TXXX:LYRICS, SYLT, and USLT tags
-                        tags_to_remove = []
-                        for tag in audio.tags.values():
-                            if isinstance(tag, TXXX) and tag.desc == "LYRICS":
-                                tags_to_remove.append(tag)
-                            elif isinstance(tag, (SYLT, USLT)):
-                                tags_to_remove.append(tag)
-                        for tag in tags_to_remove:
-                            audio.tags.delall(tag.HashKey)
-                        # Save with ID3v2.3
-                        audio.save(v2_version=3)
-                        
-                    elif file_path.lower().endswith(".flac"):
-                        audio = FLAC(file_path)
-                        # Remove TXXX:LYRICS and TXXX:UNSYNCEDLYRICS tags
-                        tags_to_remove = ["LYRICS", "UNSYNCEDLYRICS"]
-                        for tag in tags_to_remove:
-                            if tag in audio:
-                                del audio[tag]
-                        # Save the file
-                        audio.save()
+                    future.result()
                     purged += 1
-                    pbar.set_postfix({"purged": purged, "failed": failed})
-                    pbar.update(1)                    
-                    
                 except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+                    tqdm.write(f"Error processing {futures[future]}: {e}")
                     failed += 1
-                    pbar.set_postfix({"purged": purged, "failed": failed})
-                    pbar.update(1)                         
-                    continue
-        return purged, failed
+                if done % 256 == 0: # Refreshing the postfix for every file slows down huge purges
+                    pbar.set_postfix_str(f"purged={purged}, failed={failed}")
+                pbar.update(1)
+            pbar.set_postfix_str(f"purged={purged}, failed={failed}")
+    return purged, failed
+
+# Format an export result as "path to extension", failed writes also show their error
+def format_export_entry(result):
+    result_path, extension, *error = result
+    if error:
+        return f"{result_path} to {extension} ({error[0]})"
+    return f"{result_path} to {extension}"
 
 # Log the results of the export to disk
 def export_log(write_success, separate_logs, log_path):
@@ -880,25 +1167,44 @@ def export_log(write_success, separate_logs, log_path):
             for category in categories:
                 if len(write_success[category]) > 0:
                     log.write(f"{category} lyrics:\n")
-                    for result_path, extension in write_success[category]:
-                        log.write(f"{result_path} to {extension}\n")
+                    log.write("".join([f"{format_export_entry(result)}\n" for result in write_success[category]]))
                     log.write("\n")
     else:
         for category in categories:
             if len(write_success[category]) > 0:
                 with open(os.path.join(log_path, f"lyrict_export_{category}.log"), "w", encoding="utf8") as log:
-                    for result_path, extension in write_success[category]:
-                        log.write(f"{result_path} to {extension}\n")
+                    log.write("".join([f"{format_export_entry(result)}\n" for result in write_success[category]]))
 
 #################################### TAG EXTERNAL ########################################
+# Matches every header tag line of external lyrics in one scan, the name of the matching group tells which tag was found
+LRC_HEADER_PATTERN = re.compile(r'^\[(?:ar: *(?P<artist>.*) *\]'
+                                r'|al: *(?P<album>.*) *\]'
+                                r'|ti: *(?P<title>.*) *\]'
+                                r'|au: *(?P<author>.*) *\]'
+                                r'|length: *(?P<length>.*) *\]'
+                                r'|la: *(?P<language>\w{2,3})\]'
+                                r'|offset: *(?P<offset>[+-]?\d+)\]'
+                                r'|by: *(?P<lrc_author>.*) *\]'
+                                r'|(?:re|tool): *(?P<creation_software>.*) *\]'
+                                r'|ve: *(?P<software_version>.*) *\])$', re.IGNORECASE | re.MULTILINE)
+# Order and tag codes of the header lines written by tag_external
+LRC_HEADER_FIELDS = (
+    ("artist", "ar"),
+    ("album", "al"),
+    ("title", "ti"),
+    ("author", "au"),
+    ("length", "length"),
+    ("language", "la"),
+    ("offset", "offset"),
+    ("lrc_author", "by"),
+    ("creation_software", "re"),
+    ("software_version", "ve"),
+)
+
 def get_tags(file_path, extension):
     def format_time(time_in_seconds):
-        duration = timedelta(seconds=time_in_seconds)
-
         # Extract hours, minutes and seconds
-        hours = duration.seconds // 3600
-        minutes = (duration.seconds % 3600) // 60
-        seconds = duration.seconds % 60
+        hours, minutes, seconds, _ = split_milliseconds(int(time_in_seconds) * 1000)
 
         # Format the output as hh:mm:ss or mm:ss
         if hours > 0:
@@ -929,11 +1235,15 @@ def get_tags(file_path, extension):
     elif extension == "mp3":
         # Load MP3 file and read ID3 tags
         audio = MP3(file_path, ID3=ID3)
-        tags["title"] = audio.get("TIT2", TIT2()).text[0] if audio.get("TIT2") else None
-        tags["artist"] = audio.get("TPE1", TPE1()).text[0] if audio.get("TPE1") else None
-        tags["album"] = audio.get("TALB", TALB()).text[0] if audio.get("TALB") else None
-        tags["composer"] = audio.get("TCOM", TCOM()).text[0] if audio.get("TCOM") else None
-        tags["lyricist"] = audio.get("TEXT", TEXT()).text[0] if audio.get("TEXT") else None
+        # First text of a frame, looked up once and without building a throwaway default frame
+        def first_text(frame_id):
+            frame = audio.get(frame_id)
+            return frame.text[0] if frame else None
+        tags["title"] = first_text("TIT2")
+        tags["artist"] = first_text("TPE1")
+        tags["album"] = first_text("TALB")
+        tags["composer"] = first_text("TCOM")
+        tags["lyricist"] = first_text("TEXT")
         tags["length"] = format_time(audio.info.length)
 
     return tags
@@ -942,56 +1252,22 @@ def rewrite_external_lyrics(lrc_path, lyrics, tags, results, standardize):
     original_lyrics = lyrics
     if standardize and os.path.splitext(lrc_path)[1] == ".lrc":
         lyrics = standardize_timestamps(lyrics, standardize)
-    # Regular expression patterns to match all tag types
-    patterns = {
-        "artist": re.compile(r'^\[ar: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "album": re.compile(r'^\[al: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "title": re.compile(r'^\[ti: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "author": re.compile(r'^\[au: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "length": re.compile(r'^\[length: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "language": re.compile(r'^\[la: *(\w{2,3})\]$', re.IGNORECASE | re.MULTILINE),
-        "offset": re.compile(r'^\[offset: *([+-]?\d+)\]$', re.IGNORECASE | re.MULTILINE),
-        "lrc_author": re.compile(r'^\[by: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "creation_software": re.compile(r'^\[(?:re|tool): *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-        "software_version": re.compile(r'^\[ve: *(.*) *\]$', re.IGNORECASE | re.MULTILINE),
-    }
-    
     # Extracted data will initially be set to None
-    extracted = {key: None for key in patterns}
+    extracted = dict.fromkeys(LRC_HEADER_PATTERN.groupindex)
 
-    # Search and extract values for each tag using the patterns
-    for key, pattern in patterns.items():
-        match = pattern.search(lyrics)
-        if match:
-            extracted[key] = match.group(1)  # Capture the first group, which is the tag value
-            lyrics = pattern.sub('', lyrics)  # Remove matched tag line from lyrics
+    # Keep the value of the first line of each tag and remove all matched tag lines from lyrics in a single pass
+    def extract_header(match):
+        if extracted[match.lastgroup] is None:
+            extracted[match.lastgroup] = match.group(match.lastgroup)
+        return ''
+    lyrics = LRC_HEADER_PATTERN.sub(extract_header, lyrics)
 
     # Decide on "author" field with preference for lyricist if present
     final_tags = {key: tags.get(key) or extracted[key] for key in extracted}
     final_tags["author"] = tags.get("lyricist") or extracted["author"] or tags.get("composer")
 
     # Create new header lines with non-None final tags
-    header_lines = []
-    if final_tags["artist"]:
-        header_lines.append(f"[ar:{final_tags['artist']}]")
-    if final_tags["album"]:
-        header_lines.append(f"[al:{final_tags['album']}]")
-    if final_tags["title"]:
-        header_lines.append(f"[ti:{final_tags['title']}]")
-    if final_tags["author"]:
-        header_lines.append(f"[au:{final_tags['author']}]")
-    if final_tags["length"]:
-        header_lines.append(f"[length:{final_tags['length']}]")
-    if final_tags["language"]:
-        header_lines.append(f"[la:{final_tags['language']}]")
-    if final_tags["offset"]:
-        header_lines.append(f"[offset:{final_tags['offset']}]")
-    if final_tags["lrc_author"]:
-        header_lines.append(f"[by:{final_tags['lrc_author']}]")
-    if final_tags["creation_software"]:
-        header_lines.append(f"[re:{final_tags['creation_software']}]")
-    if final_tags["software_version"]:
-        header_lines.append(f"[ve:{final_tags['software_version']}]")
+    header_lines = [f"[{code}:{final_tags[key]}]" for key, code in LRC_HEADER_FIELDS if final_tags[key]]
 
     # Combine header and cleaned lyrics
     updated_lyrics = "\n".join(header_lines + [lyrics.strip()])
@@ -1003,12 +1279,44 @@ def rewrite_external_lyrics(lrc_path, lyrics, tags, results, standardize):
 
     # Write updated lyrics back to the file
     try:
-        with open(lrc_path, 'w', encoding='utf-8') as file:
-            file.write(updated_lyrics)
+        write_text_atomic(lrc_path, updated_lyrics)
         results["fixed"].append(lrc_path)
-    except PermissionError:
-        results["failed"].append(lrc_path)
-        print(f"Could not open {lrc_path} for writing.")
+    except OSError as e:
+        results["failed"].append({"path": lrc_path, "error": str(e)})
+        tqdm.write(f"Could not write {lrc_path}: {e}") # Runs in a worker thread while the progress bar is shown
+
+# Rewrite the headers of all external lyrics of one type based on the tags of their linked songs
+def tag_external_lyrics(match_categories, lyrics_ext, supported_extensions, results, standardize, progress, workers=max_workers):
+    # Group the linked songs by lyric file, so a lyric file is never rewritten by two threads at once
+    linked_songs = {}
+    for extension in supported_extensions:
+        for song_path in match_categories.get(extension, []):
+            lyric_path = os.path.splitext(song_path)[0] + f".{lyrics_ext}"
+            linked_songs.setdefault(lyric_path, []).append((song_path, extension))
+
+    # Runs in a worker thread, a lyric file linked to several songs is rewritten once per song in extension order as before
+    def tag_task(lyric_path, songs):
+        task_results = {"fixed": [], "skipped": [], "failed": []}
+        for song_path, extension in songs:
+            try:
+                lyrics = read_lyrics(lyric_path)
+                tags = get_tags(song_path, extension)
+                rewrite_external_lyrics(lyric_path, lyrics, tags, task_results, standardize)
+            except Exception as e: # An unreadable lyric or song file fails on its own, keeping what was already done
+                task_results["failed"].append({"path": lyric_path, "error": str(e)})
+            if task_results["failed"]:
+                break
+        return task_results
+
+    # Reading tags and rewriting small files is I/O bound, so threads overlap the disk access of many files
+    with tqdm(total=len(linked_songs), desc=f"fixing {lyrics_ext}s", unit=f" {lyrics_ext} files", mininterval=0.5, disable=not progress) as pbar, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(tag_task, lyric_path, songs) for lyric_path, songs in linked_songs.items()]
+        for future in as_completed(futures):
+            for category, paths in future.result().items():
+                # Every task owns one lyric file, so this keeps the results unique, a task stops at its first failure
+                results[category].extend(paths if category == "failed" else dict.fromkeys(paths))
+            pbar.update(1)
 
 def write_tag_external_log(results, separate_logs, log_path):
     if not os.access(log_path, os.W_OK | os.X_OK):
@@ -1020,15 +1328,13 @@ def write_tag_external_log(results, separate_logs, log_path):
             for category in categories:
                 if len(results[category]) > 0:
                     log.write(f"{category} files:\n")
-                    for result_path in sorted(set(results[category])):
-                            log.write(result_path+"\n")
+                    log.write("".join([format_log_entry(result)+"\n" for result in sorted(results[category], key=format_log_entry)]))
                     log.write("\n")
     else:
         for category in categories:
             if len(results[category]) > 0:
                 with open(os.path.join(log_path, f"lyrict_import_{category}.log"), "w", encoding="utf8") as log:
-                    for result_path in sorted(set(results[category])):
-                        log.write(f"{result_path}\n")
+                    log.write("".join([f"{format_log_entry(result)}\n" for result in sorted(results[category], key=format_log_entry)]))
         
 def main(args):
     directory = args.directory
@@ -1046,9 +1352,11 @@ def main(args):
     tag_external_mode = args.tag_external_mode
     mp3tag = args.mp3tag_mode
     standardize = args.standardize
+    workers = args.workers
+    walk_workers = args.walk_workers
 
     if test_run:
-        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress)
+        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress, walk_workers)
         if lrc_paths and txt_paths:
             match_categories_lrc = find_matches(lrc_paths, "lrc", extensions, progress)
             match_categories_txt = find_matches(txt_paths, "txt", extensions, progress)
@@ -1107,7 +1415,7 @@ def main(args):
 
     if mp3tag:
         action_folder = os.path.join(os.getenv('APPDATA')+"\\Mp3tag\\data\\actions\\")
-        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress)
+        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress, walk_workers)
         if lrc_paths and txt_paths:
             match_categories_lrc = find_matches(lrc_paths, "lrc", extensions, progress)
             match_categories_txt = find_matches(txt_paths, "txt", extensions, progress)
@@ -1127,7 +1435,7 @@ def main(args):
             mp3tag_flow_single(match_categories, action_folder, overwrite, extensions, "txt")
 
     if import_mode:
-        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress)
+        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress, walk_workers)
         if lrc_paths and txt_paths:
             match_categories_lrc = find_matches(lrc_paths, "lrc", extensions, progress)
             match_categories_txt = find_matches(txt_paths, "txt", extensions, progress)
@@ -1136,7 +1444,8 @@ def main(args):
                                     delete_files=delete,
                                     standardize=standardize,
                                     progress=progress,
-                                    overwrite=overwrite)
+                                    overwrite=overwrite,
+                                    workers=workers)
             if log_to_disk:
                 write_import_log(results, separate_logs, log_path)
             saved = len(results["saved"])
@@ -1151,7 +1460,8 @@ def main(args):
                                     delete_files=delete,
                                     standardize=standardize,
                                     progress=progress,
-                                    overwrite=overwrite)
+                                    overwrite=overwrite,
+                                    workers=workers)
             if log_to_disk:
                 write_import_log(results, separate_logs, log_path)
             saved = len(results["saved"])
@@ -1166,7 +1476,8 @@ def main(args):
                                     delete_files=delete,
                                     standardize=standardize,
                                     progress=progress,
-                                    overwrite=overwrite)
+                                    overwrite=overwrite,
+                                    workers=workers)
             if log_to_disk:
                 write_import_log(results, separate_logs, log_path)
             saved = len(results["saved"])
@@ -1179,8 +1490,8 @@ def main(args):
             sys.exit()
 
     if export_mode:
-        music_files = find_music_files(directory, extensions, single_folder, progress)
-        synced_lyrics, unsynced_lyrics = extract_lyrics(music_files, progress, standardize)
+        music_files = find_music_files(directory, extensions, single_folder, progress, walk_workers)
+        synced_lyrics, unsynced_lyrics, lyric_keys = extract_lyrics(music_files, progress, standardize, workers=workers, keep_keys=delete)
         write_success = {"saved":[], "skipped":[], "failed":[]}
         lrc_saved = 0
         lrc_skipped = 0
@@ -1191,15 +1502,15 @@ def main(args):
         purged = 0
         failed = 0
         if len(synced_lyrics) > 0:
-            lrc_saved, lrc_skipped, lrc_failed = write_lrc_files(synced_lyrics, ".lrc", overwrite, progress, write_success)
+            lrc_saved, lrc_skipped, lrc_failed = write_lrc_files(synced_lyrics, ".lrc", overwrite, progress, write_success, workers)
         if len(unsynced_lyrics) > 0:
-            txt_saved, txt_skipped, lrc_failed = write_lrc_files(unsynced_lyrics, ".txt", overwrite, progress, write_success)
+            txt_saved, txt_skipped, txt_failed = write_lrc_files(unsynced_lyrics, ".txt", overwrite, progress, write_success, workers)
         
         if log_to_disk:
             export_log(write_success, separate_logs, log_path)
 
         if delete:
-            purged, failed = purge_tags(write_success, progress)
+            purged, failed = purge_tags(write_success, progress, workers, lyric_keys)
         
         print(f"\n{len(music_files)} music files processed, {len(synced_lyrics)} synced lyrics and {len(unsynced_lyrics)} unsynced lyrics found.")
         if lrc_saved > 0 or lrc_skipped > 0 or lrc_failed > 0:
@@ -1213,54 +1524,18 @@ def main(args):
         sys.exit()
 
     if tag_external_mode:
-        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress)
+        lrc_paths, txt_paths = find_lrc_files(directory, single_folder, progress, walk_workers)
         supported_extensions = ["mp3", "flac"]
         results = {"fixed":[], "skipped":[], "failed":[]}
-        if lrc_paths and txt_paths:
+        if lrc_paths:
             match_categories_lrc = find_matches(lrc_paths, "lrc", extensions, progress)
+            tag_external_lyrics(match_categories_lrc, "lrc", supported_extensions, results, standardize, progress, workers)
+        if txt_paths:
             match_categories_txt = find_matches(txt_paths, "txt", extensions, progress)
-            for extension in supported_extensions:
-                if extension in match_categories_lrc:
-                    with tqdm(total = len(match_categories_lrc[extension]), desc= f"fixing {extension} lrcs", unit=f" lrc files", disable=not progress) as pbar:
-                        for song_path in match_categories_lrc[extension]:
-                            lrc_path = os.path.splitext(song_path)[0] + ".lrc"
-                            lyrics = read_lyrics(lrc_path)
-                            tags = get_tags(song_path, extension)
-                            rewrite_external_lyrics(lrc_path, lyrics, tags, results, standardize)
-                            pbar.update(1)
-                if extension in match_categories_txt:
-                    with tqdm(total = len(match_categories_txt[extension]), desc= f"fixing {extension} txts", unit=f" txt files", disable=not progress) as pbar:
-                        for song_path in match_categories_txt[extension]:
-                            txt_path = os.path.splitext(song_path)[0] + ".txt"
-                            lyrics = read_lyrics(txt_path)
-                            tags = get_tags(song_path, extension)
-                            rewrite_external_lyrics(txt_path, lyrics, tags, results, standardize)
-                            pbar.update(1)
-        elif lrc_paths and not txt_paths:
-            match_categories_lrc = find_matches(lrc_paths, "lrc", extensions, progress)
-            for extension in supported_extensions:
-                if extension in match_categories_lrc:
-                    with tqdm(total = len(match_categories_lrc[extension]), desc= f"fixing {extension} lrcs", unit=f" lrc files", disable=not progress) as pbar:
-                        for song_path in match_categories_lrc[extension]:
-                            lrc_path = os.path.splitext(song_path)[0] + ".lrc"
-                            lyrics = read_lyrics(lrc_path)
-                            tags = get_tags(song_path, extension)
-                            rewrite_external_lyrics(lrc_path, lyrics, tags, results, standardize)
-                            pbar.update(1)
-        elif not lrc_paths and txt_paths:
-            match_categories_txt = find_matches(lrc_paths, "txt", extensions, progress)
-            for extension in supported_extensions:
-                if extension in match_categories_txt:
-                    with tqdm(total = len(match_categories_txt[extension]), desc= f"fixing {extension} txts", unit=f" txt files", disable=not progress) as pbar:
-                        for song_path in match_categories_lrc[extension]:
-                            txt_path = os.path.splitext(song_path)[0] + ".txt"
-                            lyrics = read_lyrics(txt_path)
-                            tags = get_tags(song_path, extension)
-                            rewrite_external_lyrics(txt_path, lyrics, tags, results, standardize)
-                            pbar.update(1)
-        fixed = len(set(results["fixed"]))
-        skipped = len(set(results["skipped"]))
-        failed = len(set(results["failed"]))
+            tag_external_lyrics(match_categories_txt, "txt", supported_extensions, results, standardize, progress, workers)
+        fixed = len(results["fixed"])
+        skipped = len(results["skipped"])
+        failed = len(results["failed"])
         if log_to_disk:
             write_tag_external_log(results, separate_logs, log_path)
         print(f"{fixed} fixed, {skipped} skipped, {failed} failed.")